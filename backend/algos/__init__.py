@@ -0,0 +1 @@
+# Algorithm implementations used by the app services
@@ -2,15 +2,109 @@
 Simulated Annealing for TSP
 Metaheuristic that accepts worse solutions early on to escape local optima
 """
-from typing import List, Tuple
+from typing import List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
 import math
+import os
 import random
-import sys
-from pathlib import Path
+import numpy as np
+from numba import njit
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from algos.opt.tsp_2opt import calculate_route_distance, two_opt_swap
+from algos.opt.tsp_2opt import (
+    calculate_route_distance, two_opt_swap_inplace, _distance_matrix, _nearest_neighbor_tour
+)
+
+
+@njit(cache=True)
+def _double_bridge(route: np.ndarray, p1: int, p2: int, p3: int) -> np.ndarray:
+    """Double-bridge move: split the route as A|B|C|D at p1 < p2 < p3 and return A+C+B+D."""
+    return np.concatenate((route[:p1], route[p2:p3], route[p1:p2], route[p3:]))
+
+
+@njit(cache=True, nogil=True)
+def _sa_kernel(
+    route: np.ndarray,
+    D: np.ndarray,
+    initial_temp: float,
+    cooling_rate: float,
+    min_temp: float,
+    move_i: np.ndarray,
+    move_k: np.ndarray,
+    cuts: np.ndarray,
+    log_uniforms: np.ndarray
+) -> Tuple[np.ndarray, float]:
+    """
+    Compiled annealing loop over an int64 route and a distance matrix.
+    
+    Iteration t uses the pre-drawn 2-opt move (move_i[t], move_k[t]), or a
+    double-bridge kick at cuts[t] when cuts[t, 0] > 0, and log_uniforms[t].
+    """
+    n = route.shape[0]
+    max_iterations = move_i.shape[0]
+    
+    current_distance = 0.0
+    for i in range(n):
+        current_distance += D[route[i], route[(i + 1) % n]]
+    
+    best_route = route.copy()
+    best_distance = current_distance
+    
+    temp = initial_temp
+    iterations = 0
+    
+    while temp > min_temp and iterations < max_iterations:
+        p1, p2, p3 = cuts[iterations, 0], cuts[iterations, 1], cuts[iterations, 2]
+        kick = p1 > 0
+        
+        if kick:
+            # Double bridge: score the three junctions it rewires
+            a1, b0 = route[p1 - 1], route[p1]
+            b1, c0 = route[p2 - 1], route[p2]
+            c1, d0 = route[p3 - 1], route[p3]
+            delta = (D[a1, c0] + D[c1, b0] + D[b1, d0]
+                     - D[a1, b0] - D[b1, c0] - D[c1, d0])
+        else:
+            # Neighbor is a 2-opt swap of route[i..k]; score it from the two edges it changes
+            i = move_i[iterations]
+            k = move_k[iterations]
+            a, b = route[i - 1], route[i]
+            c, d = route[k], route[(k + 1) % n]
+            delta = D[a, c] + D[b, d] - D[a, b] - D[c, d]
+        
+        # Accept or reject; the route is only touched once the move is accepted.
+        # u < exp(-delta/temp) is tested as log(u) * temp < -delta to skip the exp
+        if delta < 0 or -delta > temp * log_uniforms[iterations]:
+            if kick:
+                route[:] = _double_bridge(route, p1, p2, p3)
+            else:
+                two_opt_swap_inplace(route, i, k)
+            current_distance += delta
+            
+            if current_distance < best_distance:
+                best_route[:] = route
+                best_distance = current_distance
+        
+        # Cool down
+        temp *= cooling_rate
+        iterations += 1
+    
+    return best_route, best_distance
+
+
+def _schedule_length(
+    initial_temp: float,
+    cooling_rate: float,
+    min_temp: float,
+    max_iterations: int
+) -> int:
+    """Iterations before the temperature drops to min_temp, capped at max_iterations."""
+    if initial_temp <= min_temp:
+        return 0
+    if not (0 < cooling_rate < 1 and min_temp > 0):
+        return max_iterations
+    # One extra step covers rounding in the kernel's repeated temp *= cooling_rate
+    steps = math.ceil(math.log(min_temp / initial_temp) / math.log(cooling_rate)) + 1
+    return min(max_iterations, steps)
 
 
 def tsp_simulated_annealing(
@@ -19,62 +113,117 @@ def tsp_simulated_annealing(
     initial_temp: float = 1000.0,
     cooling_rate: float = 0.995,
     min_temp: float = 0.1,
-    max_iterations: int = 10000
+    max_iterations: int = 10000,
+    seed: Optional[int] = None,
+    D: Optional[np.ndarray] = None,
+    double_bridge_prob: float = 0.05
 ) -> Tuple[List[int], float]:
     """
     Solve TSP using Simulated Annealing.
     
     Args:
         coordinates: List of (x, y) coordinates for each location
-        initial_route: Optional starting route
+        initial_route: Optional starting route (defaults to a nearest-neighbor tour)
         initial_temp: Starting temperature
         cooling_rate: Temperature reduction factor per iteration
         min_temp: Minimum temperature to stop
         max_iterations: Maximum iterations
+        seed: Optional RNG seed for reproducible runs
+        D: Optional precomputed distance matrix for coordinates
+        double_bridge_prob: Chance per iteration of proposing a double-bridge
+            kick instead of a 2-opt swap
         
     Returns:
         Tuple of (best_route, best_distance)
     """
     n = len(coordinates)
-    if n < 2:
-        return list(range(n)), 0.0
+    if n < 3:
+        # Every ordering of two stops is the same tour
+        route = list(range(n))
+        return route, calculate_route_distance(route, coordinates)
+    
+    if seed is None:
+        seed = random.randrange(2**31)
+    
+    rng = np.random.default_rng(seed)
     
-    # Initialize route
+    # Distances are looked up from the matrix instead of recomputed every iteration
+    if D is None:
+        D = _distance_matrix(coordinates)
+    
+    # Initialize route (a nearest-neighbor tour unless one is given)
     if initial_route is None:
-        route = list(range(n))
-        random.shuffle(route)
+        route = _nearest_neighbor_tour(D)
     else:
-        route = initial_route.copy()
+        route = np.array(initial_route, dtype=np.int64)
     
-    best_route = route.copy()
-    best_distance = calculate_route_distance(route, coordinates)
-    current_distance = best_distance
+    # Only as many iterations as the cooling schedule allows are ever used
+    steps = _schedule_length(initial_temp, cooling_rate, min_temp, max_iterations)
     
-    temp = initial_temp
-    iterations = 0
+    # Draw every move and acceptance uniform up front: i in [1, n-2], k in [i+1, n-1]
+    move_i = rng.integers(1, n - 1, size=steps)
+    move_k = move_i + 1 + (rng.random(steps) * (n - 1 - move_i)).astype(np.int64)
     
-    while temp > min_temp and iterations < max_iterations:
-        iterations += 1
-        
-        # Generate neighbor by 2-opt swap
-        i = random.randint(1, n - 2)
-        k = random.randint(i + 1, n - 1)
-        new_route = two_opt_swap(route, i, k)
-        new_distance = calculate_route_distance(new_route, coordinates)
-        
-        # Accept or reject
-        delta = new_distance - current_distance
-        
-        if delta < 0 or random.random() < math.exp(-delta / temp):
-            route = new_route
-            current_distance = new_distance
-            
-            if new_distance < best_distance:
-                best_route = new_route.copy()
-                best_distance = new_distance
-        
-        # Cool down
-        temp *= cooling_rate
+    # Kick iterations get three distinct cut points 1 <= p1 < p2 < p3 <= n-1; others are zeroed
+    cuts = np.sort(rng.integers(1, n, size=(steps, 3)), axis=1)
+    kicks = rng.random(steps) < double_bridge_prob
+    kicks &= (cuts[:, 0] < cuts[:, 1]) & (cuts[:, 1] < cuts[:, 2])
+    cuts[~kicks] = 0
     
-    return best_route, best_distance
+    log_uniforms = np.log(np.maximum(rng.random(steps), np.finfo(np.float64).tiny))
+    
+    best_route, best_distance = _sa_kernel(
+        route, D, float(initial_temp), float(cooling_rate), float(min_temp), move_i, move_k, cuts, log_uniforms
+    )
+    return best_route.tolist(), float(best_distance)
+
 
+def tsp_simulated_annealing_multi(
+    coordinates: List[Tuple[float, float]],
+    k_chains: int = 8,
+    initial_temp: float = 1000.0,
+    cooling_rate: float = 0.995,
+    min_temp: float = 0.1,
+    max_iterations: int = 10000,
+    seed: Optional[int] = None,
+    D: Optional[np.ndarray] = None
+) -> Tuple[List[int], float]:
+    """
+    Run several independent annealing chains and keep the best tour.
+    
+    Each chain samples its own moves from seed + c. The compiled kernel
+    releases the GIL, so chains on the thread pool run on separate cores.
+    
+    Args:
+        coordinates: List of (x, y) coordinates for each location
+        k_chains: Number of independent chains
+        initial_temp: Starting temperature
+        cooling_rate: Temperature reduction factor per iteration
+        min_temp: Minimum temperature to stop
+        max_iterations: Maximum iterations per chain
+        seed: Optional RNG seed; chain c uses seed + c
+        D: Optional precomputed distance matrix for coordinates
+        
+    Returns:
+        Tuple of (best_route, best_distance)
+    """
+    if seed is None:
+        seed = random.randrange(2**31)
+    if D is None:
+        D = _distance_matrix(coordinates)
+    
+    def run_chain(chain: int) -> Tuple[List[int], float]:
+        return tsp_simulated_annealing(
+            coordinates,
+            initial_temp=initial_temp,
+            cooling_rate=cooling_rate,
+            min_temp=min_temp,
+            max_iterations=max_iterations,
+            seed=seed + chain,
+            D=D
+        )
+    
+    with ThreadPoolExecutor(max_workers=min(k_chains, os.cpu_count() or 1)) as executor:
+        results = list(executor.map(run_chain, range(k_chains)))
+    
+    return min(results, key=lambda result: result[1])
@@ -4,121 +4,150 @@ Handles multiple constraints: budget and weight
 Returns the optimal selection and total value
 """
 from typing import List, Dict, Tuple, Optional
+import numpy as np
+from numba import njit
+
+from algos.opt.packed_items import PackedItems, pack_items
+
+
+@njit(cache=True, nogil=True)
+def _knapsack_kernel(
+    costs: np.ndarray,
+    weights: np.ndarray,
+    values: np.ndarray,
+    B: int,
+    W: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compiled DP over a (B+1) x (W+1) table.
+    
+    Cells are updated in reverse so each item is used at most once.
+    keep[i, b] is a bitmap over w packed into uint64 words.
+    """
+    n = costs.shape[0]
+    words = (W + 64) // 64
+    dp = np.zeros((B + 1, W + 1), dtype=np.float64)
+    keep = np.zeros((n, B + 1, words), dtype=np.uint64)
+    
+    for i in range(n):
+        c, wi, v = costs[i], weights[i], values[i]
+        for b in range(B, c - 1, -1):
+            for w in range(W, wi - 1, -1):
+                cand = dp[b - c, w - wi] + v
+                if cand > dp[b, w]:
+                    dp[b, w] = cand
+                    keep[i, b, w >> 6] |= np.uint64(1) << np.uint64(w & 63)
+    
+    return dp, keep
+
+
+def scaled_capacities(
+    packed: PackedItems,
+    budget: float,
+    max_weight: float
+) -> Tuple[np.ndarray, np.ndarray, int, int]:
+    """
+    Integer item sizes and table capacities for the DP.
+    
+    Returns:
+        Tuple of (costs, weights, B, W) after dividing by the common step
+    """
+    # Convert floats to integers for DP table (multiply by 100 to preserve 2 decimal places).
+    # Item sizes are rounded so 0.29 * 100 = 28.999... counts as 29 cents; the
+    # capacities get a small epsilon before flooring for the same reason
+    costs = np.rint(packed.costs * 100).astype(np.int64)
+    weights = np.rint(packed.weights * 100).astype(np.int64)
+    
+    # Shrink the table: divide by the common step of the item sizes and never
+    # allocate more capacity than all items together could use
+    n = len(costs)
+    cost_step = int(np.gcd.reduce(costs)) if n else 0
+    weight_step = int(np.gcd.reduce(weights)) if n else 0
+    B = min(int(budget * 100 + 1e-6), int(costs.sum())) // cost_step if cost_step else 0
+    W = min(int(max_weight * 100 + 1e-6), int(weights.sum())) // weight_step if weight_step else 0
+    if cost_step:
+        costs //= cost_step
+    if weight_step:
+        weights //= weight_step
+    
+    return costs, weights, B, W
+
+
+def apply_category_limit(
+    selected_indices: List[int],
+    packed: PackedItems,
+    category_limit: Dict[str, int]
+) -> List[int]:
+    """Drop selected items past their category's limit, keeping selection order."""
+    category_counts = {}
+    filtered_indices = []
+    for idx in selected_indices:
+        cat = packed.cat_names[packed.cat_ids[idx]]
+        if cat in category_limit:
+            current_count = category_counts.get(cat, 0)
+            if current_count >= category_limit[cat]:
+                continue
+            category_counts[cat] = current_count + 1
+        filtered_indices.append(idx)
+    return filtered_indices
 
 
 def knapsack_dp(
     items: List[Dict],
     budget: float,
     max_weight: float,
-    category_limit: Optional[Dict[str, int]] = None
+    category_limit: Optional[Dict[str, int]] = None,
+    packed: Optional[PackedItems] = None
 ) -> Tuple[List[Dict], float, float, float]:
     """
     Solve 0/1 knapsack with budget and weight constraints.
     
-    Uses DP with memoization. State is (item_index, remaining_budget, remaining_weight, category_counts).
-    For simplicity with category limits, we'll use a simpler approach that tracks selections.
+    Uses a dense DP table over (budget, weight): dp[b][w] is the best value
+    using at most b budget and w weight. Each item is folded in by a compiled
+    kernel, and a bit per (i, b, w) records whether item i was taken so the
+    selection can be traced back.
     
     Args:
         items: List of items with 'name', 'value', 'weight', 'cost', 'category'
         budget: Maximum budget constraint
         max_weight: Maximum weight constraint
         category_limit: Optional dict of category -> max count
+        packed: Optional pre-packed arrays for items (built here if omitted)
         
     Returns:
         Tuple of (selected_items, total_value, total_cost, total_weight)
     """
-    n = len(items)
-    
-    # Convert floats to integers for DP table (multiply by 100 to preserve 2 decimal places)
-    budget_int = int(budget * 100)
-    max_weight_int = int(max_weight * 100)
-    
-    # DP table: dp[i][b][w] = max value achievable
-    # Using dict for sparse representation since we might have large constraint values
-    # Actually, let's use a 2D table approach: dp[b][w] = (max_value, parent_trace)
-    # We'll iterate through items and update the table
+    if packed is None:
+        packed = pack_items(items)
     
-    # For each (budget, weight) combination, store the best value and which items were selected
-    # We'll use a simpler approach: iterate items and build up the solution
+    costs, weights, B, W = scaled_capacities(packed, budget, max_weight)
     
-    # dp[b][w] = best value with budget b and weight w
-    dp = {}
-    parent = {}  # parent[(b, w)] = (prev_b, prev_w, item_idx) or None
+    dp, keep = _knapsack_kernel(costs, weights, packed.values, B, W)
     
-    # Initialize: dp[0][0] = 0
-    dp[(0, 0)] = 0.0
-    parent[(0, 0)] = None
-    
-    # Process each item
-    for i in range(n):
-        item = items[i]
-        cost_int = int(item['cost'] * 100)
-        weight_int = int(item['weight'] * 100)
-        value = item['value']
-        category = item.get('category', '')
-        
-        # Check category limit
-        can_take = True
-        if category_limit and category in category_limit:
-            # For now, we'll check this when building the solution
-            # This is a simplification - proper solution would track category counts in state
-            pass
-        
-        # Iterate through all current states in reverse to avoid using same item twice
-        current_states = list(dp.keys())
-        for b, w in current_states:
-            new_b = b + cost_int
-            new_w = w + weight_int
-            
-            # Check constraints
-            if new_b > budget_int or new_w > max_weight_int:
-                continue
-            
-            # Check if this state gives better value
-            current_value = dp.get((b, w), 0.0)
-            new_value = current_value + value
-            
-            if new_value > dp.get((new_b, new_w), -1.0):
-                dp[(new_b, new_w)] = new_value
-                parent[(new_b, new_w)] = (b, w, i)
-    
-    # Find best state
-    best_value = 0.0
-    best_state = (0, 0)
-    for (b, w), value in dp.items():
-        if value > best_value:
-            best_value = value
-            best_state = (b, w)
-    
-    # Trace back to find selected items
+    # Trace back from the full capacity
     selected_indices = []
-    current_state = best_state
-    while current_state in parent and parent[current_state] is not None:
-        prev_b, prev_w, item_idx = parent[current_state]
-        selected_indices.append(item_idx)
-        current_state = (prev_b, prev_w)
+    b, w = B, W
+    for i in range(len(items) - 1, -1, -1):
+        if (keep[i, b, w >> 6] >> np.uint64(w & 63)) & np.uint64(1):
+            selected_indices.append(i)
+            b -= costs[i]
+            w -= weights[i]
     
     selected_indices.reverse()
     
+    total_value = float(dp[B, W])
+    
     # Apply category limits (post-processing filter)
     if category_limit:
-        category_counts = {}
-        filtered_indices = []
-        for idx in selected_indices:
-            item = items[idx]
-            cat = item.get('category', '')
-            if cat in category_limit:
-                current_count = category_counts.get(cat, 0)
-                if current_count >= category_limit[cat]:
-                    continue
-                category_counts[cat] = current_count + 1
-            filtered_indices.append(idx)
-        selected_indices = filtered_indices
-    
-    # Build result
+        kept_indices = apply_category_limit(selected_indices, packed, category_limit)
+        if len(kept_indices) < len(selected_indices):
+            total_value = float(packed.values[kept_indices].sum())
+        selected_indices = kept_indices
+    
+    # Build result; cost and weight come from the unscaled arrays since the
+    # table works on truncated cents
     selected_items = [items[i] for i in selected_indices]
-    total_cost = sum(item['cost'] for item in selected_items)
-    total_weight = sum(item['weight'] for item in selected_items)
-    total_value = sum(item['value'] for item in selected_items)
+    total_cost = float(packed.costs[selected_indices].sum())
+    total_weight = float(packed.weights[selected_indices].sum())
     
     return selected_items, total_value, total_cost, total_weight
@@ -2,14 +2,65 @@
 Greedy approach to knapsack - sort by value/cost ratio and take items
 Not optimal but fast and sometimes close
 """
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+import numpy as np
+from numba import njit
+
+from algos.opt.packed_items import PackedItems, pack_items
+
+
+@njit(cache=True, nogil=True)
+def _greedy_kernel(
+    order: np.ndarray,
+    costs: np.ndarray,
+    weights: np.ndarray,
+    values: np.ndarray,
+    cat_ids: np.ndarray,
+    limits: np.ndarray,
+    counted: np.ndarray,
+    budget: float,
+    max_weight: float
+) -> Tuple[np.ndarray, float, float, float]:
+    """Take items in the given order while they fit; returns picked indices and totals."""
+    selected = np.empty(order.shape[0], dtype=np.int64)
+    num_selected = 0
+    counts = np.zeros(limits.shape[0], dtype=np.int64)
+    total_cost = 0.0
+    total_weight = 0.0
+    total_value = 0.0
+    
+    for idx in order:
+        cid = cat_ids[idx]
+        
+        # Check constraints
+        if total_cost + costs[idx] > budget:
+            continue
+        if total_weight + weights[idx] > max_weight:
+            continue
+        
+        # Check category limit
+        if counts[cid] >= limits[cid]:
+            continue
+        
+        # Take it!
+        selected[num_selected] = idx
+        num_selected += 1
+        total_cost += costs[idx]
+        total_weight += weights[idx]
+        total_value += values[idx]
+        
+        if counted[cid]:
+            counts[cid] += 1
+    
+    return selected[:num_selected], total_value, total_cost, total_weight
 
 
 def knapsack_greedy(
     items: List[Dict],
     budget: float,
     max_weight: float,
-    category_limit: Dict[str, int] = None
+    category_limit: Dict[str, int] = None,
+    packed: Optional[PackedItems] = None
 ) -> Tuple[List[Dict], float, float, float]:
     """
     Greedy knapsack: sort by value/cost ratio and take items greedily.
@@ -19,50 +70,33 @@ def knapsack_greedy(
         budget: Maximum budget constraint
         max_weight: Maximum weight constraint
         category_limit: Optional dict of category -> max count
+        packed: Optional pre-packed arrays for items (built here if omitted)
         
     Returns:
         Tuple of (selected_items, total_value, total_cost, total_weight)
     """
-    # Create items with index for tracking
-    indexed_items = [(i, item) for i, item in enumerate(items)]
+    if packed is None:
+        packed = pack_items(items)
+    costs, weights, values = packed.costs, packed.weights, packed.values
     
-    # Sort by value/cost ratio (best bang for buck)
-    indexed_items.sort(key=lambda x: x[1]['value'] / x[1]['cost'] if x[1]['cost'] > 0 else 0, reverse=True)
+    # Sort by value/cost ratio (best bang for buck); free items rank as ratio 0
+    ratio = values / np.where(costs > 0, costs, np.inf)
+    order = np.argsort(-ratio, kind='stable')
     
-    selected_items = []
-    selected_indices = set()
-    total_cost = 0.0
-    total_weight = 0.0
-    total_value = 0.0
-    category_counts = {}
+    # Per-category limits as an array indexed by category id (uncapped = int max)
+    num_cats = len(packed.cat_names)
+    limits = np.full(num_cats, np.iinfo(np.int64).max, dtype=np.int64)
+    if category_limit:
+        for cid, name in enumerate(packed.cat_names):
+            if name in category_limit:
+                limits[cid] = category_limit[name]
     
-    for idx, item in indexed_items:
-        cost = item['cost']
-        weight = item['weight']
-        value = item['value']
-        category = item.get('category', '')
-        
-        # Check constraints
-        if total_cost + cost > budget:
-            continue
-        if total_weight + weight > max_weight:
-            continue
-        
-        # Check category limit
-        if category_limit and category in category_limit:
-            current_count = category_counts.get(category, 0)
-            if current_count >= category_limit[category]:
-                continue
-        
-        # Take it!
-        selected_items.append(item)
-        selected_indices.add(idx)
-        total_cost += cost
-        total_weight += weight
-        total_value += value
-        
-        if category:
-            category_counts[category] = category_counts.get(category, 0) + 1
+    # Uncategorized items are never counted toward a limit
+    counted = np.array([bool(name) for name in packed.cat_names], dtype=np.bool_)
     
-    return selected_items, total_value, total_cost, total_weight
-
+    selected, total_value, total_cost, total_weight = _greedy_kernel(
+        order, costs, weights, values, packed.cat_ids, limits, counted, float(budget), float(max_weight)
+    )
+    
+    selected_items = [items[i] for i in selected.tolist()]
+    return selected_items, float(total_value), float(total_cost), float(total_weight)
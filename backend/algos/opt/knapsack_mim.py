@@ -0,0 +1,132 @@
+"""
+0/1 Knapsack using meet-in-the-middle
+Exact like the DP, but its cost depends on the item count instead of the
+budget/weight magnitudes - good for up to ~40 items with large constraints
+"""
+from typing import List, Dict, Tuple, Optional
+import numpy as np
+from numba import njit
+
+from algos.opt.packed_items import PackedItems, pack_items
+from algos.opt.knapsack_dp import scaled_capacities, apply_category_limit
+
+
+def _enumerate_subsets(
+    costs: np.ndarray,
+    weights: np.ndarray,
+    values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Totals of every subset; entry m is the subset whose bitmask is m."""
+    c = np.zeros(1, dtype=np.int64)
+    w = np.zeros(1, dtype=np.int64)
+    v = np.zeros(1, dtype=np.float64)
+    for j in range(len(costs)):
+        c = np.concatenate((c, c + costs[j]))
+        w = np.concatenate((w, w + weights[j]))
+        v = np.concatenate((v, v + values[j]))
+    return c, w, v
+
+
+@njit(cache=True, nogil=True)
+def _mim_kernel(
+    lc: np.ndarray, lw: np.ndarray, lv: np.ndarray,
+    rc: np.ndarray, rw: np.ndarray, rv: np.ndarray,
+    B: int, W: int
+) -> Tuple[float, int, int]:
+    """
+    Best pair of left/right subsets under both capacities.
+    
+    Left subsets are visited by increasing leftover budget while right subsets
+    are added in cost order, so every inserted right subset fits the budget.
+    A Fenwick tree over right weights then answers "best value with weight
+    <= leftover weight" in O(log n).
+    """
+    weight_keys = np.unique(rw)
+    m = weight_keys.shape[0]
+    tree_val = np.full(m + 1, -1.0)
+    tree_idx = np.zeros(m + 1, dtype=np.int64)
+    
+    r_order = np.argsort(rc, kind='mergesort')
+    l_order = np.argsort(-lc, kind='mergesort')
+    
+    best_value = -1.0
+    best_left = 0
+    best_right = 0
+    ptr = 0
+    
+    for li in l_order:
+        rem_b = B - lc[li]
+        rem_w = W - lw[li]
+        if rem_b < 0 or rem_w < 0:
+            continue
+        
+        while ptr < r_order.shape[0] and rc[r_order[ptr]] <= rem_b:
+            ri = r_order[ptr]
+            pos = np.searchsorted(weight_keys, rw[ri]) + 1
+            while pos <= m:
+                if rv[ri] > tree_val[pos]:
+                    tree_val[pos] = rv[ri]
+                    tree_idx[pos] = ri
+                pos += pos & -pos
+            ptr += 1
+        
+        pos = np.searchsorted(weight_keys, rem_w, side='right')
+        while pos > 0:
+            if tree_val[pos] >= 0 and lv[li] + tree_val[pos] > best_value:
+                best_value = lv[li] + tree_val[pos]
+                best_left = li
+                best_right = tree_idx[pos]
+            pos -= pos & -pos
+    
+    return best_value, best_left, best_right
+
+
+def knapsack_mim(
+    items: List[Dict],
+    budget: float,
+    max_weight: float,
+    category_limit: Optional[Dict[str, int]] = None,
+    packed: Optional[PackedItems] = None
+) -> Tuple[List[Dict], float, float, float]:
+    """
+    Solve 0/1 knapsack with budget and weight constraints by meet-in-the-middle.
+    
+    Enumerates the 2^(n/2) subsets of each half of the items and joins them,
+    so it runs in O(2^(n/2) * n) regardless of how large budget and weight are.
+    
+    Args:
+        items: List of items with 'name', 'value', 'weight', 'cost', 'category'
+        budget: Maximum budget constraint
+        max_weight: Maximum weight constraint
+        category_limit: Optional dict of category -> max count
+        packed: Optional pre-packed arrays for items (built here if omitted)
+    
+    Returns:
+        Tuple of (selected_items, total_value, total_cost, total_weight)
+    """
+    if packed is None:
+        packed = pack_items(items)
+    
+    costs, weights, B, W = scaled_capacities(packed, budget, max_weight)
+    values = packed.values
+    half = len(items) // 2
+    
+    lc, lw, lv = _enumerate_subsets(costs[:half], weights[:half], values[:half])
+    rc, rw, rv = _enumerate_subsets(costs[half:], weights[half:], values[half:])
+    
+    _, left_mask, right_mask = _mim_kernel(lc, lw, lv, rc, rw, rv, B, W)
+    
+    selected_indices = [i for i in range(half) if left_mask >> i & 1]
+    selected_indices += [half + i for i in range(len(items) - half) if right_mask >> i & 1]
+    
+    # Apply category limits (post-processing filter)
+    if category_limit:
+        selected_indices = apply_category_limit(selected_indices, packed, category_limit)
+    
+    # Build result
+    selected_items = [items[i] for i in selected_indices]
+    total_cost = sum(item['cost'] for item in selected_items)
+    total_weight = sum(item['weight'] for item in selected_items)
+    total_value = sum(item['value'] for item in selected_items)
+    
+    return selected_items, total_value, total_cost, total_weight
@@ -5,6 +5,11 @@ Solves fantasy lineup optimization with position and salary constraints
 from typing import List, Dict, Tuple, Optional
 from ortools.sat.python import cp_model
 
+# Lineup models are tiny, so one search worker is enough and the cap keeps
+# a pathological request from holding a worker thread
+SOLVER_WORKERS = 1
+SOLVER_TIME_LIMIT = 1.0
+
 
 def optimize_lineup(
     players: List[Dict],
@@ -37,13 +42,13 @@ def optimize_lineup(
     # Decision variables: x[i] = 1 if player i is selected, 0 otherwise
     x = [model.NewBoolVar(f'player_{i}') for i in range(n)]
     
-    # Objective: maximize total projection
-    objective = model.NewIntVar(0, int(sum(p['projection'] * 100 for p in players)), 'objective')
-    model.Add(objective == sum(int(players[i]['projection'] * 100) * x[i] for i in range(n)))
-    model.Maximize(objective)
+    # Objective: maximize total projection (scaled to integers)
+    projections = [int(p['projection'] * 100) for p in players]
+    model.Maximize(cp_model.LinearExpr.WeightedSum(x, projections))
     
     # Constraint: salary cap
-    model.Add(sum(players[i]['salary'] * x[i] for i in range(n)) <= salary_cap)
+    salaries = [p['salary'] for p in players]
+    model.Add(cp_model.LinearExpr.WeightedSum(x, salaries) <= salary_cap)
     
     # Position constraints
     position_counts = {}
@@ -59,6 +64,8 @@ def optimize_lineup(
     
     # Solve
     solver = cp_model.CpSolver()
+    solver.parameters.num_workers = SOLVER_WORKERS
+    solver.parameters.max_time_in_seconds = SOLVER_TIME_LIMIT
     status = solver.Solve(model)
     
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
@@ -90,6 +97,12 @@ def optimize_lineup(
             constraint_info["position_counts"][pos] = count
         
         return selected_players, total_projection, total_salary, constraint_info
+    elif status == cp_model.UNKNOWN:
+        # Hit the time limit before finding any lineup; says nothing about feasibility
+        return [], 0.0, 0, {
+            "status": "timeout",
+            "error": f"No lineup found within the {SOLVER_TIME_LIMIT:g}s time limit"
+        }
     else:
         # No solution found
         return [], 0.0, 0, {
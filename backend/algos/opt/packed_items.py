@@ -0,0 +1,33 @@
+"""
+Struct-of-arrays view of knapsack items
+Converts the list of item dicts once so the solvers work on contiguous arrays
+"""
+from typing import List, Dict, NamedTuple
+import numpy as np
+
+
+class PackedItems(NamedTuple):
+    costs: np.ndarray      # float64
+    weights: np.ndarray    # float64
+    values: np.ndarray     # float64
+    cat_ids: np.ndarray    # int32 index into cat_names
+    cat_names: List[str]
+    names: List[str]
+
+
+def pack_items(items: List[Dict]) -> PackedItems:
+    """Convert items with 'name', 'value', 'weight', 'cost', 'category' into parallel arrays."""
+    n = len(items)
+    cat_index: Dict[str, int] = {}
+    cat_ids = np.empty(n, dtype=np.int32)
+    for i, item in enumerate(items):
+        cat_ids[i] = cat_index.setdefault(item.get('category', ''), len(cat_index))
+    
+    return PackedItems(
+        costs=np.fromiter((item['cost'] for item in items), dtype=np.float64, count=n),
+        weights=np.fromiter((item['weight'] for item in items), dtype=np.float64, count=n),
+        values=np.fromiter((item['value'] for item in items), dtype=np.float64, count=n),
+        cat_ids=cat_ids,
+        cat_names=list(cat_index),
+        names=[item['name'] for item in items]
+    )
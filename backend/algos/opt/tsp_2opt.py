@@ -2,8 +2,13 @@
 2-opt algorithm for TSP
 Simple local search that improves a route by swapping edges
 """
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 import math
+import numpy as np
+from numba import njit
+
+# Candidate list size for 2-opt: moves are only tried toward a city's nearest neighbors
+NEIGHBOR_K = 20
 
 
 def calculate_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
@@ -11,11 +16,25 @@ def calculate_distance(coord1: Tuple[float, float], coord2: Tuple[float, float])
     return math.sqrt((coord1[0] - coord2[0])**2 + (coord1[1] - coord2[1])**2)
 
 
-def calculate_route_distance(route: List[int], coordinates: List[Tuple[float, float]]) -> float:
-    """Calculate total distance of a route."""
+def _distance_matrix(coordinates: List[Tuple[float, float]]) -> np.ndarray:
+    """Build the n x n matrix of pairwise Euclidean distances."""
+    coords = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    return np.linalg.norm(coords[:, None, :] - coords[None, :, :], axis=-1)
+
+
+def calculate_route_distance(
+    route: List[int],
+    coordinates: List[Tuple[float, float]],
+    D: Optional[np.ndarray] = None
+) -> float:
+    """Calculate total distance of a route (uses D for lookups when given)."""
     if len(route) < 2:
         return 0.0
     
+    if D is not None:
+        r = np.asarray(route)
+        return float(D[r, np.roll(r, -1)].sum())
+    
     total = 0.0
     for i in range(len(route)):
         j = (i + 1) % len(route)
@@ -23,24 +42,181 @@ def calculate_route_distance(route: List[int], coordinates: List[Tuple[float, fl
     return total
 
 
+@njit(cache=True)
+def two_opt_swap_inplace(route: np.ndarray, i: int, k: int) -> None:
+    """Perform 2-opt swap in place: reverse route[i..k] with a two-pointer walk."""
+    while i < k:
+        route[i], route[k] = route[k], route[i]
+        i += 1
+        k -= 1
+
+
 def two_opt_swap(route: List[int], i: int, k: int) -> List[int]:
-    """Perform 2-opt swap: reverse the segment between i and k."""
-    new_route = route[:i] + route[i:k+1][::-1] + route[k+1:]
-    return new_route
+    """Perform 2-opt swap: return a copy with the segment between i and k reversed."""
+    new_route = np.array(route, dtype=np.int64)
+    two_opt_swap_inplace(new_route, i, k)
+    return new_route.tolist()
+
+
+def _neighbor_lists(D: np.ndarray, k: int) -> np.ndarray:
+    """For each city, its k nearest other cities ordered by distance."""
+    n = D.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64)
+    
+    masked = D.copy()
+    np.fill_diagonal(masked, np.inf)
+    
+    # Partition out the k closest per row, then sort just those k
+    nearest = np.argpartition(masked, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(masked, nearest, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+@njit(cache=True)
+def _nearest_neighbor_tour(D: np.ndarray) -> np.ndarray:
+    """Greedy starting tour: from city 0, always move to the closest unvisited city."""
+    n = D.shape[0]
+    tour = np.empty(n, dtype=np.int64)
+    visited = np.zeros(n, dtype=np.bool_)
+    current = 0
+    
+    for step in range(n):
+        tour[step] = current
+        visited[current] = True
+        
+        nearest = -1
+        nearest_distance = np.inf
+        for j in range(n):
+            if not visited[j] and D[current, j] < nearest_distance:
+                nearest = j
+                nearest_distance = D[current, j]
+        current = nearest
+    
+    return tour
+
+
+@njit(cache=True)
+def _reverse_segment(route: np.ndarray, pos: np.ndarray, i: int, k: int) -> None:
+    """Reverse route[i..k] in place, keeping pos (city -> index) in sync."""
+    while i < k:
+        a, b = route[i], route[k]
+        route[i], route[k] = b, a
+        pos[b], pos[a] = i, k
+        i += 1
+        k -= 1
+
+
+@njit(cache=True, nogil=True)
+def _two_opt_kernel(
+    route: np.ndarray,
+    D: np.ndarray,
+    neighbors: np.ndarray,
+    max_iterations: int
+) -> np.ndarray:
+    """
+    Compiled 2-opt over an int64 route, improving it in place.
+    
+    For each city a, only moves that add an edge (a, c) with c among a's
+    nearest neighbors are tried, and only while (a, c) is shorter than the
+    tour edge it would replace at a. Cities whose last search found nothing
+    get a don't-look bit and are skipped until a neighboring move clears it.
+    """
+    n = route.shape[0]
+    pos = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        pos[route[i]] = i
+    dont_look = np.zeros(n, dtype=np.bool_)
+    
+    # Candidate edge lengths laid out like neighbors, so the pruning test
+    # reads one contiguous row instead of gathering from D
+    k = neighbors.shape[1]
+    neighbor_dist = np.empty((n, k), dtype=D.dtype)
+    for a in range(n):
+        for m in range(k):
+            neighbor_dist[a, m] = D[a, neighbors[a, m]]
+    
+    improved = True
+    iterations = 0
+    
+    while improved and iterations < max_iterations:
+        improved = False
+        iterations += 1
+        
+        for a in range(n):
+            if dont_look[a]:
+                continue
+            
+            found = False
+            i = pos[a]
+            
+            # Successor side: replace (a,b),(c,d) with (a,c),(b,d), b after a and d after c
+            b = route[(i + 1) % n]
+            d_ab = D[a, b]
+            for m in range(k):
+                if neighbor_dist[a, m] >= d_ab:
+                    break
+                c = neighbors[a, m]
+                j = pos[c]
+                d = route[(j + 1) % n]
+                delta = neighbor_dist[a, m] + D[b, d] - d_ab - D[c, d]
+                if delta < -1e-12:
+                    # Reverse the path b..c, or the equivalent complement if it wraps
+                    if (i + 1) % n <= j:
+                        _reverse_segment(route, pos, (i + 1) % n, j)
+                    else:
+                        _reverse_segment(route, pos, j + 1, i)
+                    dont_look[b] = dont_look[c] = dont_look[d] = False
+                    found = True
+                    break
+            
+            # Predecessor side: replace (b,a),(d,c) with (a,c),(b,d), b before a and d before c
+            if not found:
+                b = route[(i - 1) % n]
+                d_ba = D[b, a]
+                for m in range(k):
+                    if neighbor_dist[a, m] >= d_ba:
+                        break
+                    c = neighbors[a, m]
+                    j = pos[c]
+                    d = route[(j - 1) % n]
+                    delta = neighbor_dist[a, m] + D[b, d] - d_ba - D[d, c]
+                    if delta < -1e-12:
+                        # Reverse the path a..d, or the equivalent complement if it wraps
+                        if i <= (j - 1) % n:
+                            _reverse_segment(route, pos, i, (j - 1) % n)
+                        else:
+                            _reverse_segment(route, pos, j, i - 1)
+                        dont_look[b] = dont_look[c] = dont_look[d] = False
+                        found = True
+                        break
+            
+            if found:
+                improved = True
+            else:
+                dont_look[a] = True
+    
+    return route
 
 
 def tsp_2opt(
     coordinates: List[Tuple[float, float]],
     initial_route: List[int] = None,
-    max_iterations: int = 1000
+    max_iterations: int = 1000,
+    D: Optional[np.ndarray] = None,
+    neighbors: Optional[np.ndarray] = None
 ) -> Tuple[List[int], float]:
     """
     Solve TSP using 2-opt local search.
     
     Args:
         coordinates: List of (x, y) coordinates for each location
-        initial_route: Optional starting route (defaults to [0, 1, 2, ...])
-        max_iterations: Maximum iterations to run
+        initial_route: Optional starting route (defaults to a nearest-neighbor tour)
+        max_iterations: Maximum number of improvement passes
+        D: Optional precomputed distance matrix for coordinates
+        neighbors: Optional candidate lists, row c holding c's nearest cities
+            (defaults to the NEIGHBOR_K nearest)
         
     Returns:
         Tuple of (best_route, best_distance)
@@ -49,37 +225,17 @@ def tsp_2opt(
     if n < 2:
         return list(range(n)), 0.0
     
-    # Start with initial route (or simple sequential if not provided)
+    # Pairwise distances, so each candidate move costs four lookups instead of a full route sum
+    if D is None:
+        D = _distance_matrix(coordinates)
+    if neighbors is None:
+        neighbors = _neighbor_lists(D, NEIGHBOR_K)
+    
+    # Start with initial route (or a nearest-neighbor tour if not provided)
     if initial_route is None:
-        route = list(range(n))
+        route = _nearest_neighbor_tour(D)
     else:
-        route = initial_route.copy()
-    
-    best_route = route.copy()
-    best_distance = calculate_route_distance(route, coordinates)
+        route = np.array(initial_route, dtype=np.int64)
     
-    improved = True
-    iterations = 0
-    
-    while improved and iterations < max_iterations:
-        improved = False
-        iterations += 1
-        
-        for i in range(1, n - 1):
-            for k in range(i + 1, n):
-                # Try 2-opt swap
-                new_route = two_opt_swap(route, i, k)
-                new_distance = calculate_route_distance(new_route, coordinates)
-                
-                if new_distance < best_distance:
-                    best_route = new_route
-                    best_distance = new_distance
-                    route = new_route
-                    improved = True
-                    break
-            
-            if improved:
-                break
-    
-    return best_route, best_distance
-
+    route = _two_opt_kernel(route, D, neighbors, max_iterations)
+    return route.tolist(), calculate_route_distance(route, coordinates, D)
@@ -4,12 +4,10 @@ API endpoints for the lineup optimizer
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
-import sys
 from pathlib import Path
 import json
+import asyncio
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from services.lineup_optimizer import solve_lineup
 
 router = APIRouter(prefix="/api/lineup", tags=["lineup"])
@@ -41,11 +39,13 @@ def get_example():
 
 
 @router.post("/solve")
-def solve_lineup_problem(request: LineupRequest):
+async def solve_lineup_problem(request: LineupRequest):
     """Solve a lineup optimization problem."""
     try:
-        players_dict = [player.dict() for player in request.players]
-        result = solve_lineup(
+        # Dump the whole list in one pydantic-core call instead of one .dict() per model
+        players_dict = request.model_dump(include={'players'})['players']
+        result = await asyncio.to_thread(
+            solve_lineup,
             players=players_dict,
             salary_cap=request.salary_cap,
             positions=request.positions,
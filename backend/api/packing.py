@@ -4,12 +4,10 @@ API endpoints for the packing planner
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
-import sys
 from pathlib import Path
 import json
+import asyncio
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from services.packing_planner import solve_packing, compare_algorithms
 
 router = APIRouter(prefix="/api/packing", tags=["packing"])
@@ -53,11 +51,12 @@ def get_example():
 
 
 @router.post("/solve", response_model=PackingResponse)
-def solve_packing_problem(request: PackingRequest):
+async def solve_packing_problem(request: PackingRequest):
     """Solve a packing problem with the specified algorithm."""
     try:
-        items_dict = [item.dict() for item in request.items]
-        result = solve_packing(
+        items_dict = request.model_dump(include={'items'})['items']
+        result = await asyncio.to_thread(
+            solve_packing,
             items=items_dict,
             budget=request.budget,
             max_weight=request.max_weight,
@@ -70,11 +69,12 @@ def solve_packing_problem(request: PackingRequest):
 
 
 @router.post("/compare")
-def compare_packing_algorithms(request: PackingRequest):
+async def compare_packing_algorithms(request: PackingRequest):
     """Compare DP vs Greedy algorithms for the packing problem."""
     try:
-        items_dict = [item.dict() for item in request.items]
-        result = compare_algorithms(
+        items_dict = request.model_dump(include={'items'})['items']
+        result = await asyncio.to_thread(
+            compare_algorithms,
             items=items_dict,
             budget=request.budget,
             max_weight=request.max_weight,
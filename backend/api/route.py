@@ -2,14 +2,13 @@
 API endpoints for the route planner
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
-import sys
 from pathlib import Path
 import json
+import asyncio
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from services.route_planner import solve_route, compare_algorithms
 
 router = APIRouter(prefix="/api/route", tags=["route"])
@@ -40,30 +39,32 @@ def get_example():
 
 
 @router.post("/solve")
-def solve_route_problem(request: RouteRequest):
+async def solve_route_problem(request: RouteRequest):
     """Solve a route optimization problem."""
     try:
-        stops_dict = [stop.dict() for stop in request.stops]
-        result = solve_route(
+        stops_dict = request.model_dump(include={'stops'})['stops']
+        result = await asyncio.to_thread(
+            solve_route,
             home=request.home,
             stops=stops_dict,
             algorithm=request.algorithm
         )
-        return result
+        return ORJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/compare")
-def compare_route_algorithms(request: RouteRequest):
+async def compare_route_algorithms(request: RouteRequest):
     """Compare 2-opt vs Simulated Annealing for route optimization."""
     try:
-        stops_dict = [stop.dict() for stop in request.stops]
-        result = compare_algorithms(
+        stops_dict = request.model_dump(include={'stops'})['stops']
+        result = await asyncio.to_thread(
+            compare_algorithms,
             home=request.home,
             stops=stops_dict
         )
-        return result
+        return ORJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
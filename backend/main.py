@@ -2,13 +2,30 @@
 Main FastAPI app for Algorithms Arcade
 Just a basic setup to get things running
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from api.packing import router as packing_router
 from api.route import router as route_router
 from api.lineup import router as lineup_router
+from services.warmup import warm_up_kernels
 
-app = FastAPI(title="Algorithms Arcade API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile/load the solver kernels at startup rather than on the first request
+    warm_up_kernels()
+    yield
+
+
+# orjson serializes the large result payloads much faster than the stdlib encoder
+app = FastAPI(
+    title="Algorithms Arcade API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 app.include_router(packing_router)
 app.include_router(route_router)
 app.include_router(lineup_router)
@@ -3,11 +3,7 @@ Service for the lineup optimizer app
 Handles fantasy lineup optimization using ILP
 """
 from typing import List, Dict, Optional
-import sys
-from pathlib import Path
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from algos.opt.lineup_optimizer import optimize_lineup
 
 
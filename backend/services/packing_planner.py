@@ -3,13 +3,18 @@ Service for the packing planner app
 Handles the business logic for knapsack optimization
 """
 from typing import List, Dict, Optional
-import sys
-from pathlib import Path
+from functools import partial
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from algos.opt.knapsack_dp import knapsack_dp
+from algos.opt.knapsack_dp import knapsack_dp, scaled_capacities
+from algos.opt.knapsack_mim import knapsack_mim
 from algos.opt.knapsack_greedy import knapsack_greedy
+from algos.opt.packed_items import PackedItems, pack_items
+from services.parallel import run_concurrently
+
+# Above this many DP table cells, small item sets switch to meet-in-the-middle
+# and larger ones fall back to greedy, since the table would not fit in memory
+DP_MAX_CELLS = 5_000_000
+MIM_MAX_ITEMS = 40
 
 
 def solve_packing(
@@ -17,7 +22,8 @@ def solve_packing(
     budget: float,
     max_weight: float,
     category_limit: Optional[Dict[str, int]] = None,
-    algorithm: str = "dp"
+    algorithm: str = "dp",
+    packed: Optional[PackedItems] = None
 ) -> Dict:
     """
     Solve packing problem using specified algorithm.
@@ -28,14 +34,27 @@ def solve_packing(
         max_weight: Weight constraint
         category_limit: Optional category limits
         algorithm: "dp" or "greedy"
+        packed: Optional items already converted with pack_items
         
     Returns:
-        Result dict with selected items, totals, and stats
+        Result dict with selected items, totals, and stats; algorithm is
+        "greedy" when a dp request was too large to solve exactly
     """
+    if packed is None:
+        packed = pack_items(items)
+    
     if algorithm == "dp":
-        selected, value, cost, weight = knapsack_dp(items, budget, max_weight, category_limit)
+        _, _, B, W = scaled_capacities(packed, budget, max_weight)
+        if (B + 1) * (W + 1) <= DP_MAX_CELLS:
+            selected, value, cost, weight = knapsack_dp(items, budget, max_weight, category_limit, packed)
+        elif len(items) <= MIM_MAX_ITEMS:
+            selected, value, cost, weight = knapsack_mim(items, budget, max_weight, category_limit, packed)
+        else:
+            # No exact solver fits; report the approximate answer as greedy
+            algorithm = "greedy"
+            selected, value, cost, weight = knapsack_greedy(items, budget, max_weight, category_limit, packed)
     elif algorithm == "greedy":
-        selected, value, cost, weight = knapsack_greedy(items, budget, max_weight, category_limit)
+        selected, value, cost, weight = knapsack_greedy(items, budget, max_weight, category_limit, packed)
     else:
         raise ValueError(f"Unknown algorithm: {algorithm}")
     
@@ -62,8 +81,13 @@ def compare_algorithms(
     Returns:
         Dict with both results and comparison stats
     """
-    dp_result = solve_packing(items, budget, max_weight, category_limit, "dp")
-    greedy_result = solve_packing(items, budget, max_weight, category_limit, "greedy")
+    # Convert items to arrays once and share them between both solvers
+    packed = pack_items(items)
+    args = (items, budget, max_weight, category_limit)
+    dp_result, greedy_result = run_concurrently(
+        partial(solve_packing, *args, "dp", packed),
+        partial(solve_packing, *args, "greedy", packed)
+    )
     
     dp_value = dp_result["total_value"]
     greedy_value = greedy_result["total_value"]
@@ -76,7 +100,7 @@ def compare_algorithms(
         "comparison": {
             "value_difference": dp_value - greedy_value,
             "improvement_pct": improvement,
-            "dp_better": dp_value > greedy_value
+            "dp_better": dp_value > greedy_value,
+            "exact": dp_result["algorithm"] == "dp"
         }
     }
-
@@ -0,0 +1,17 @@
+"""
+Run independent solves side by side for the compare endpoints
+"""
+from typing import Callable, List, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+
+T = TypeVar("T")
+
+
+def run_concurrently(*calls: Callable[[], T]) -> List[T]:
+    """
+    Run each call on its own thread and return the results in order.
+    The solver kernels are compiled with nogil, so the calls really overlap.
+    """
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = [executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
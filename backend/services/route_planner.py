@@ -2,21 +2,50 @@
 Service for the route planner app
 Handles TSP optimization for errand routing
 """
-from typing import List, Dict, Tuple, Optional
-import sys
-from pathlib import Path
+from typing import List, Dict, Tuple, Optional, NamedTuple
+from functools import lru_cache, partial
+import os
+import numpy as np
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from algos.opt.tsp_2opt import tsp_2opt, calculate_distance
-from algos.meta.simulated_annealing import tsp_simulated_annealing
+# Optional GPU support for building large distance matrices
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
 
+from algos.opt.tsp_2opt import tsp_2opt, _distance_matrix, _neighbor_lists, NEIGHBOR_K
+from algos.opt.tsp_held_karp import held_karp
+from algos.meta.simulated_annealing import tsp_simulated_annealing_multi
+from services.parallel import run_concurrently
 
+# Up to this many locations (home included) the exact solver runs in
+# milliseconds, so the heuristics are skipped
+EXACT_MAX_LOCATIONS = 15
+
+# Independent SA chains per solve, one per core so wall time stays that of a single chain
+SA_CHAINS = min(8, os.cpu_count() or 1)
+
+# From this many locations the distance matrix is built on the GPU when cupy
+# and a device are available; below it the transfer costs more than it saves
+GPU_MIN_LOCATIONS = 2000
+
+# Distance matrices and candidate lists are only cached up to this many
+# locations (a 4MB float32 matrix), which bounds the caches to about 128MB
+CACHE_MAX_LOCATIONS = 1000
+ROUTING_CACHE_SIZE = 32
+
+# Geocoded coordinates by address for the batch path; cleared when full
+GEOCODE_CACHE_SIZE = 4096
+_GEO_CACHE: Dict[str, Tuple[float, float]] = {}
+
+
+@lru_cache(maxsize=GEOCODE_CACHE_SIZE)
 def geocode_address(address: str) -> Tuple[float, float]:
     """
     Convert address to coordinates.
     For MVP, we'll use a simple hash-based approach to generate fake coordinates.
     In production, you'd use a geocoding API like Google Maps, OpenStreetMap, etc.
+    Results are memoized since a real geocoder would be a network round-trip.
     """
     # Simple hash-based coordinate generation for demo
     # In real app, use actual geocoding service
@@ -26,10 +55,129 @@ def geocode_address(address: str) -> Tuple[float, float]:
     return (lat, lon)
 
 
+def _hash_coords(addresses: List[str]) -> np.ndarray:
+    """Vectorized form of the hash-based coordinates in geocode_address."""
+    hash_vals = np.fromiter((hash(a) for a in addresses), dtype=np.int64, count=len(addresses))
+    hash_vals %= 1000000
+    coords = np.empty((len(addresses), 2), dtype=np.float64)
+    coords[:, 0] = 37.7749 + (hash_vals % 1000) / 10000
+    coords[:, 1] = -122.4194 + ((hash_vals // 1000) % 1000) / 10000
+    return coords
+
+
+def geocode_batch(addresses: List[str], out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Geocode many addresses at once, same coordinates as geocode_address.
+    Only addresses missing from the cache are geocoded.
+    Returns an (n, 2) array of (lat, lon) rows, written into out if given.
+    """
+    coords = np.empty((len(addresses), 2), dtype=np.float64) if out is None else out
+    cached = [_GEO_CACHE.get(a) for a in addresses]
+    hit_rows = [i for i, c in enumerate(cached) if c is not None]
+    miss_rows = [i for i, c in enumerate(cached) if c is None]
+    
+    if hit_rows:
+        coords[hit_rows] = [cached[i] for i in hit_rows]
+    if miss_rows:
+        missing = [addresses[i] for i in miss_rows]
+        coords[miss_rows] = _hash_coords(missing)
+        if len(_GEO_CACHE) + len(missing) > GEOCODE_CACHE_SIZE:
+            _GEO_CACHE.clear()
+        _GEO_CACHE.update(zip(missing, map(tuple, coords[miss_rows].tolist())))
+    
+    return coords
+
+
+@lru_cache(maxsize=ROUTING_CACHE_SIZE)
+def _cached_distance_matrix(coords_key: bytes) -> np.ndarray:
+    """
+    Distance matrix for a set of coordinates, shared across solver calls.
+    Keyed by the raw bytes of the (n, 2) float64 coordinate array; only
+    used for routes of up to CACHE_MAX_LOCATIONS locations.
+    """
+    return _build_distance_matrix(coords_key)
+
+
+def _build_distance_matrix(coords_key: bytes) -> np.ndarray:
+    """
+    Distance matrix for the coordinates packed in coords_key.
+    Stored as float32, which is plenty for street distances and halves the
+    memory the solvers stream through. Returned read-only since the same
+    array is handed to every caller.
+    """
+    coords = np.frombuffer(coords_key, dtype=np.float64).reshape(-1, 2)
+    if len(coords) >= GPU_MIN_LOCATIONS and _gpu_available():
+        D = _distance_matrix_gpu(coords)
+    else:
+        D = _distance_matrix(coords).astype(np.float32)
+    D.setflags(write=False)
+    return D
+
+
+@lru_cache(maxsize=1)
+def _gpu_available() -> bool:
+    """True when cupy is installed and can see a CUDA device."""
+    if cp is None:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except cp.cuda.runtime.CUDARuntimeError:
+        return False
+
+
+def _distance_matrix_gpu(coords: np.ndarray) -> np.ndarray:
+    """Same matrix as _distance_matrix in float32, computed with cupy."""
+    pts = cp.asarray(coords)
+    D = cp.linalg.norm(pts[:, None, :] - pts[None, :, :], axis=-1).astype(cp.float32)
+    return cp.asnumpy(D)
+
+
+@lru_cache(maxsize=ROUTING_CACHE_SIZE)
+def _cached_neighbor_lists(coords_key: bytes) -> np.ndarray:
+    """2-opt candidate lists for the same coordinates as _cached_distance_matrix."""
+    return _build_neighbor_lists(_cached_distance_matrix(coords_key))
+
+
+def _build_neighbor_lists(D: np.ndarray) -> np.ndarray:
+    """Read-only 2-opt candidate lists for a distance matrix."""
+    neighbors = _neighbor_lists(D, NEIGHBOR_K)
+    neighbors.setflags(write=False)
+    return neighbors
+
+
+def _geocode_all(home: str, stops: List[Dict]) -> np.ndarray:
+    """Coordinates of home (row 0) followed by every stop (rows 1..n)."""
+    all_coords = np.empty((len(stops) + 1, 2), dtype=np.float64)
+    all_coords[0] = geocode_address(home)
+    geocode_batch([stop['address'] for stop in stops], out=all_coords[1:])
+    return all_coords
+
+
+class RoutingInputs(NamedTuple):
+    all_coords: np.ndarray      # (n, 2) float64, home is row 0
+    coords_key: bytes           # key into the distance/neighbor caches
+    D: Optional[np.ndarray]     # None when there is nothing to route
+
+
+def prepare_inputs(home: str, stops: List[Dict]) -> RoutingInputs:
+    """Geocode once and build the distance matrix, for sharing between solves."""
+    all_coords = _geocode_all(home, stops)
+    coords_key = all_coords.tobytes()
+    n = len(all_coords)
+    if n < 2:
+        D = None
+    elif n <= CACHE_MAX_LOCATIONS:
+        D = _cached_distance_matrix(coords_key)
+    else:
+        D = _build_distance_matrix(coords_key)
+    return RoutingInputs(all_coords, coords_key, D)
+
+
 def solve_route(
     home: str,
     stops: List[Dict],
-    algorithm: str = "2opt"
+    algorithm: str = "2opt",
+    inputs: Optional[RoutingInputs] = None
 ) -> Dict:
     """
     Solve route optimization problem.
@@ -38,16 +186,15 @@ def solve_route(
         home: Home address
         stops: List of stops with name, address, hours, duration
         algorithm: "2opt" or "simulated_annealing"
+        inputs: Optional output of prepare_inputs for the same home and stops
         
     Returns:
-        Result dict with optimized route and stats
+        Result dict with optimized route and stats; route_order and the
+        coordinates are numpy arrays
     """
-    # Geocode all locations
-    home_coord = geocode_address(home)
-    stop_coords = [geocode_address(stop['address']) for stop in stops]
-    
-    # Combine home + stops (home is index 0, stops are 1..n)
-    all_coords = [home_coord] + stop_coords
+    if inputs is None:
+        inputs = prepare_inputs(home, stops)
+    all_coords, coords_key, D = inputs
     n = len(all_coords)
     
     if n < 2:
@@ -60,44 +207,49 @@ def solve_route(
     
     # Solve TSP (excluding return to home for now, or include it)
     # For errands, we typically want to return home, so add home at the end
-    if algorithm == "2opt":
-        route, distance = tsp_2opt(all_coords)
-    elif algorithm == "simulated_annealing":
-        route, distance = tsp_simulated_annealing(all_coords)
-    else:
+    if algorithm not in ("2opt", "simulated_annealing"):
         raise ValueError(f"Unknown algorithm: {algorithm}")
     
+    # Small routes are solved exactly; report that rather than the requested
+    # heuristic so callers know which solver produced the route
+    if n <= EXACT_MAX_LOCATIONS:
+        algorithm = "held_karp"
+        route, distance = held_karp(D)
+    elif algorithm == "2opt":
+        if n <= CACHE_MAX_LOCATIONS:
+            neighbors = _cached_neighbor_lists(coords_key)
+        else:
+            neighbors = _build_neighbor_lists(D)
+        route, distance = tsp_2opt(all_coords, D=D, neighbors=neighbors)
+    elif algorithm == "simulated_annealing":
+        route, distance = tsp_simulated_annealing_multi(all_coords, k_chains=SA_CHAINS, D=D)
+    
     # Ensure route starts at home (index 0)
+    route = np.asarray(route)
     if route[0] != 0:
         # Rotate route to start at home
-        start_idx = route.index(0)
-        route = route[start_idx:] + route[:start_idx]
+        start_idx = int((route == 0).argmax())
+        route = np.roll(route, -start_idx)
     
-    # Optionally add return to home
+    # Add the return to home; the solvers' distance already covers that
+    # closing leg since they score the tour as a cycle
     if route[-1] != 0:
-        route.append(0)
-        distance += calculate_distance(all_coords[route[-2]], all_coords[0])
+        route = np.append(route, 0)
     
-    # Build route details
-    route_stops = []
-    for idx in route:
-        if idx == 0:
-            route_stops.append({
-                "name": "Home",
-                "address": home,
-                "index": 0,
-                "coordinates": all_coords[0]
-            })
-        else:
-            stop_idx = idx - 1
-            route_stops.append({
-                "name": stops[stop_idx]["name"],
-                "address": stops[stop_idx]["address"],
-                "hours": stops[stop_idx].get("hours"),
-                "duration": stops[stop_idx].get("duration", 0),
-                "index": idx,
-                "coordinates": all_coords[idx]
-            })
+    # Build route details: one entry per location, then gather them in route order.
+    # Coordinates and the route order stay numpy; the API serializes them with orjson
+    details = [{"name": "Home", "address": home, "index": 0}]
+    details += [
+        {
+            "name": stop["name"],
+            "address": stop["address"],
+            "hours": stop.get("hours"),
+            "duration": stop.get("duration", 0),
+            "index": idx
+        }
+        for idx, stop in enumerate(stops, start=1)
+    ]
+    route_stops = [{**details[idx], "coordinates": all_coords[idx]} for idx in route.tolist()]
     
     return {
         "route": route_stops,
@@ -113,8 +265,17 @@ def compare_algorithms(
     stops: List[Dict]
 ) -> Dict:
     """Compare 2-opt vs Simulated Annealing."""
-    result_2opt = solve_route(home, stops, "2opt")
-    result_sa = solve_route(home, stops, "simulated_annealing")
+    # Small routes are solved exactly whichever algorithm is asked for,
+    # so solve once; both entries carry the same Held-Karp result
+    if len(stops) + 1 <= EXACT_MAX_LOCATIONS:
+        result_2opt = result_sa = solve_route(home, stops, "2opt")
+    else:
+        # Geocode and build the distance matrix once for both runs
+        inputs = prepare_inputs(home, stops)
+        result_2opt, result_sa = run_concurrently(
+            partial(solve_route, home, stops, "2opt", inputs),
+            partial(solve_route, home, stops, "simulated_annealing", inputs)
+        )
     
     return {
         "2opt": result_2opt,
@@ -122,7 +283,7 @@ def compare_algorithms(
         "comparison": {
             "distance_difference": result_2opt["total_distance"] - result_sa["total_distance"],
             "improvement_pct": ((result_2opt["total_distance"] - result_sa["total_distance"]) / result_2opt["total_distance"] * 100) if result_2opt["total_distance"] > 0 else 0,
-            "sa_better": result_sa["total_distance"] < result_2opt["total_distance"]
+            "sa_better": result_sa["total_distance"] < result_2opt["total_distance"],
+            "exact": result_2opt["algorithm"] == "held_karp"
         }
     }
-
@@ -0,0 +1,38 @@
+"""
+Startup warm-up for the compiled solver kernels
+The kernels live in algos; this only makes sure their first real call
+doesn't pay for compilation or cache loading
+"""
+import numpy as np
+
+from algos.opt.tsp_2opt import tsp_2opt, _distance_matrix, _neighbor_lists, NEIGHBOR_K
+from algos.opt.tsp_held_karp import held_karp
+from algos.meta.simulated_annealing import tsp_simulated_annealing
+from algos.opt.knapsack_dp import knapsack_dp
+from algos.opt.knapsack_mim import knapsack_mim
+from algos.opt.knapsack_greedy import knapsack_greedy
+
+_WARM_UP_COORDS = [(0.0, 0.0), (0.0, 1.0), (1.0, 1.0), (1.0, 0.0)]
+
+_WARM_UP_ITEMS = [
+    {"name": "a", "value": 3.0, "weight": 1.0, "cost": 2.0, "category": "x"},
+    {"name": "b", "value": 2.0, "weight": 2.0, "cost": 1.0, "category": ""},
+    {"name": "c", "value": 4.0, "weight": 1.5, "cost": 3.0, "category": "x"}
+]
+
+
+def warm_up_kernels() -> None:
+    """Run every route and knapsack kernel once on a tiny instance."""
+    # Same dtype and read-only flag as the route planner's cached arrays,
+    # so the same kernel specializations get compiled
+    D = _distance_matrix(_WARM_UP_COORDS).astype(np.float32)
+    D.setflags(write=False)
+    neighbors = _neighbor_lists(D, NEIGHBOR_K)
+    neighbors.setflags(write=False)
+    tsp_2opt(_WARM_UP_COORDS, D=D, neighbors=neighbors)
+    tsp_simulated_annealing(_WARM_UP_COORDS, max_iterations=10, seed=0, D=D)
+    held_karp(D)
+    
+    knapsack_dp(_WARM_UP_ITEMS, 4.0, 3.0)
+    knapsack_mim(_WARM_UP_ITEMS, 4.0, 3.0)
+    knapsack_greedy(_WARM_UP_ITEMS, 4.0, 3.0, {"x": 1})
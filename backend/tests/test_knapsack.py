@@ -0,0 +1,129 @@
+"""
+Brute-force checks for the exact knapsack solvers (DP and meet-in-the-middle)
+Most sizes are multiples of 0.25; the cent tests use values such as 0.29
+that aren't exact in binary
+"""
+import itertools
+import random
+
+import pytest
+
+from algos.opt.knapsack_dp import knapsack_dp
+from algos.opt.knapsack_mim import knapsack_mim
+
+
+def random_items(rng: random.Random, n: int):
+    return [
+        {
+            "name": f"item{i}",
+            "value": rng.randint(1, 40) + rng.random(),
+            "weight": rng.randint(0, 12) / 4,
+            "cost": rng.randint(0, 16) / 4,
+            "category": rng.choice(["a", "b", ""])
+        }
+        for i in range(n)
+    ]
+
+
+def exhaustive_best(items, budget, max_weight):
+    """Best total value over every subset that fits both constraints."""
+    best = 0.0
+    for mask in itertools.product((0, 1), repeat=len(items)):
+        chosen = [item for item, take in zip(items, mask) if take]
+        if sum(i["cost"] for i in chosen) <= budget + 1e-9 and sum(i["weight"] for i in chosen) <= max_weight + 1e-9:
+            best = max(best, sum(i["value"] for i in chosen))
+    return best
+
+
+def check_result(result, budget, max_weight):
+    selected, total_value, total_cost, total_weight = result
+    assert total_value == pytest.approx(sum(i["value"] for i in selected))
+    assert total_cost == pytest.approx(sum(i["cost"] for i in selected))
+    assert total_weight == pytest.approx(sum(i["weight"] for i in selected))
+    assert total_cost <= budget + 1e-9
+    assert total_weight <= max_weight + 1e-9
+    assert len({i["name"] for i in selected}) == len(selected)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_dp_matches_exhaustive_search(seed):
+    rng = random.Random(seed)
+    items = random_items(rng, rng.randint(0, 11))
+    budget = rng.randint(1, 40) / 4
+    max_weight = rng.randint(1, 30) / 4
+    
+    result = knapsack_dp(items, budget, max_weight)
+    
+    check_result(result, budget, max_weight)
+    assert result[1] == pytest.approx(exhaustive_best(items, budget, max_weight))
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_mim_matches_exhaustive_search(seed):
+    rng = random.Random(1000 + seed)
+    items = random_items(rng, rng.randint(0, 11))
+    budget = rng.randint(1, 40) / 4
+    max_weight = rng.randint(1, 30) / 4
+    
+    result = knapsack_mim(items, budget, max_weight)
+    
+    check_result(result, budget, max_weight)
+    assert result[1] == pytest.approx(exhaustive_best(items, budget, max_weight))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_mim_matches_dp(seed):
+    rng = random.Random(2000 + seed)
+    items = random_items(rng, rng.randint(12, 18))
+    budget = rng.randint(4, 60) / 4
+    max_weight = rng.randint(4, 40) / 4
+    
+    mim_result = knapsack_mim(items, budget, max_weight)
+    dp_result = knapsack_dp(items, budget, max_weight)
+    
+    check_result(mim_result, budget, max_weight)
+    assert mim_result[1] == pytest.approx(dp_result[1])
+
+
+def test_dp_category_limit_is_respected():
+    rng = random.Random(7)
+    items = random_items(rng, 10)
+    
+    selected, total_value, _, _ = knapsack_dp(items, 10.0, 8.0, category_limit={"a": 1, "b": 2})
+    
+    assert sum(1 for i in selected if i["category"] == "a") <= 1
+    assert sum(1 for i in selected if i["category"] == "b") <= 2
+    assert total_value == pytest.approx(sum(i["value"] for i in selected))
+
+
+@pytest.mark.parametrize("solver", [knapsack_dp, knapsack_mim])
+def test_cent_sizes_are_not_truncated(solver):
+    # 0.29 * 100 and 0.57 * 100 fall just short of 29 and 57 in floating point
+    items = [
+        {"name": "a", "value": 5.0, "weight": 0.29, "cost": 0.29, "category": ""},
+        {"name": "b", "value": 7.0, "weight": 0.57, "cost": 0.57, "category": ""}
+    ]
+    
+    selected, total_value, total_cost, _ = solver(items, 0.85, 1.0)
+    assert total_value == pytest.approx(7.0)
+    assert total_cost <= 0.85
+    
+    selected, total_value, _, _ = solver(items, 0.57, 0.57)
+    assert [i["name"] for i in selected] == ["b"]
+
+
+@pytest.mark.parametrize("solver", [knapsack_dp, knapsack_mim])
+@pytest.mark.parametrize("seed", range(20))
+def test_cent_sizes_match_exhaustive_search(solver, seed):
+    rng = random.Random(3000 + seed)
+    items = random_items(rng, rng.randint(1, 10))
+    for item in items:
+        item["weight"] = rng.randint(0, 300) / 100
+        item["cost"] = rng.randint(0, 400) / 100
+    budget = rng.randint(1, 1000) / 100
+    max_weight = rng.randint(1, 800) / 100
+    
+    result = solver(items, budget, max_weight)
+    
+    check_result(result, budget, max_weight)
+    assert result[1] == pytest.approx(exhaustive_best(items, budget, max_weight))
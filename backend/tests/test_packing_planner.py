@@ -0,0 +1,52 @@
+"""
+Checks that dp requests stay within the DP table cap
+"""
+import random
+
+import pytest
+
+from algos.opt.knapsack_greedy import knapsack_greedy
+from services.packing_planner import solve_packing, compare_algorithms
+
+
+def fine_grained_items(n: int):
+    rng = random.Random(n)
+    return [
+        {
+            "name": f"item{i}",
+            "value": rng.randint(1, 40) + rng.random(),
+            "weight": rng.randint(1, 400) / 100 + 0.01,
+            "cost": rng.randint(1, 2000) / 100 + 0.01,
+            "category": ""
+        }
+        for i in range(n)
+    ]
+
+
+def test_dp_over_cap_falls_back_to_greedy():
+    # 45 items with a cent-precise budget of 500 and weight of 40 would need
+    # a table of roughly 200 million cells
+    items = fine_grained_items(45)
+    
+    result = solve_packing(items, 500.0, 40.0, algorithm="dp")
+    
+    assert result["algorithm"] == "greedy"
+    assert result["total_value"] == pytest.approx(knapsack_greedy(items, 500.0, 40.0)[1])
+    assert result["total_cost"] <= 500.0 + 1e-9
+    assert result["total_weight"] <= 40.0 + 1e-9
+
+
+def test_dp_over_cap_uses_mim_for_few_items():
+    items = fine_grained_items(20)
+    
+    result = solve_packing(items, 500.0, 40.0, algorithm="dp")
+    
+    assert result["algorithm"] == "dp"
+    assert result["total_value"] >= knapsack_greedy(items, 500.0, 40.0)[1] - 1e-9
+
+
+def test_compare_marks_fallback_as_inexact():
+    result = compare_algorithms(fine_grained_items(45), 500.0, 40.0)
+    
+    assert result["comparison"]["exact"] is False
+    assert result["dp"]["algorithm"] == "greedy"
@@ -0,0 +1,32 @@
+"""
+Checks that simulated annealing reports the true length of its best tour
+The kernel tracks distance through move deltas, so a wrong delta would show
+up as a mismatch against a full recomputation
+"""
+import numpy as np
+import pytest
+
+from algos.opt.tsp_2opt import calculate_route_distance
+from algos.meta.simulated_annealing import tsp_simulated_annealing
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_reported_distance_matches_route(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(3, 61))
+    coords = [tuple(c) for c in rng.random((n, 2))]
+    
+    route, distance = tsp_simulated_annealing(coords, seed=seed, double_bridge_prob=0.3)
+    
+    assert sorted(route) == list(range(n))
+    assert distance == pytest.approx(calculate_route_distance(route, coords), rel=1e-9)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2])
+def test_tiny_inputs_return_trivial_route(n):
+    coords = [(0.0, 0.0), (3.0, 4.0)][:n]
+    
+    route, distance = tsp_simulated_annealing(coords, seed=0)
+    
+    assert route == list(range(n))
+    assert distance == pytest.approx(10.0 if n == 2 else 0.0)
@@ -0,0 +1,48 @@
+"""
+Randomized checks for the candidate-list 2-opt kernel
+"""
+import numpy as np
+import pytest
+
+from algos.opt.tsp_2opt import (
+    tsp_2opt,
+    calculate_route_distance,
+    _distance_matrix,
+    _nearest_neighbor_tour
+)
+
+
+def random_instance(seed: int):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(2, 61))
+    coords = [tuple(c) for c in rng.random((n, 2))]
+    return coords, _distance_matrix(coords)
+
+
+def check_route(route, distance, coords, D, rel):
+    n = len(coords)
+    assert sorted(route) == list(range(n))
+    assert distance == pytest.approx(calculate_route_distance(route, coords), rel=rel)
+    nn_distance = calculate_route_distance(_nearest_neighbor_tour(D).tolist(), coords)
+    assert distance <= nn_distance * (1 + rel) + 1e-12
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_two_opt_float64(seed):
+    coords, D = random_instance(seed)
+    
+    route, distance = tsp_2opt(coords, D=D)
+    
+    check_route(route, distance, coords, D, rel=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_two_opt_read_only_float32(seed):
+    # The route planner hands the solver its cached read-only float32 matrix
+    coords, D = random_instance(1000 + seed)
+    D = D.astype(np.float32)
+    D.setflags(write=False)
+    
+    route, distance = tsp_2opt(coords, D=D)
+    
+    check_route(route, distance, coords, D, rel=1e-5)
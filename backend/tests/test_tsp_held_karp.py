@@ -0,0 +1,56 @@
+"""
+Brute-force checks for the exact Held-Karp TSP solver
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from algos.opt.tsp_2opt import _distance_matrix
+from algos.opt.tsp_held_karp import held_karp
+
+
+def tour_length(route, D):
+    return float(sum(D[route[i], route[(i + 1) % len(route)]] for i in range(len(route))))
+
+
+def exhaustive_best(D):
+    """Shortest closed tour over every ordering of locations 1..n-1 after 0."""
+    n = D.shape[0]
+    return min(tour_length((0,) + perm, D) for perm in itertools.permutations(range(1, n)))
+
+
+@pytest.mark.parametrize("n", range(3, 9))
+@pytest.mark.parametrize("seed", range(5))
+def test_held_karp_matches_permutations(n, seed):
+    coords = np.random.default_rng(seed * 100 + n).random((n, 2))
+    D = _distance_matrix(coords)
+    
+    route, distance = held_karp(D)
+    
+    assert route[0] == 0
+    assert sorted(route) == list(range(n))
+    assert distance == pytest.approx(tour_length(route, D))
+    assert distance == pytest.approx(exhaustive_best(D))
+
+
+def test_held_karp_read_only_float32_matrix():
+    # The route planner hands the solver its cached read-only float32 matrix
+    coords = np.random.default_rng(3).random((7, 2))
+    D = _distance_matrix(coords).astype(np.float32)
+    D.setflags(write=False)
+    
+    route, distance = held_karp(D)
+    
+    assert sorted(route) == list(range(7))
+    assert distance == pytest.approx(exhaustive_best(D), rel=1e-6)
+
+
+@pytest.mark.parametrize("n", [1, 2])
+def test_held_karp_trivial_sizes(n):
+    D = _distance_matrix(np.random.default_rng(0).random((n, 2)))
+    
+    route, distance = held_karp(D)
+    
+    assert route == list(range(n))
+    assert distance == pytest.approx(tour_length(route, D) if n > 1 else 0.0)
@@ -26,6 +26,7 @@ interface ComparisonResult {
     value_difference: number
     improvement_pct: number
     dp_better: boolean
+    exact: boolean
   }
 }
 
@@ -244,7 +245,9 @@ function PackingPlanner() {
           </div>
 
           <div className="improvement">
-            {comparison.comparison.dp_better ? (
+            {!comparison.comparison.exact ? (
+              <p>Too large for an exact solve: both show the greedy result</p>
+            ) : comparison.comparison.dp_better ? (
               <p>
                 DP is <strong>{comparison.comparison.improvement_pct.toFixed(1)}%</strong> better
                 (+{comparison.comparison.value_difference.toFixed(2)} value)
@@ -32,6 +32,7 @@ interface ComparisonResult {
     distance_difference: number
     improvement_pct: number
     sa_better: boolean
+    exact: boolean
   }
 }
 
@@ -293,7 +294,9 @@ function RoutePlanner() {
           </div>
 
           <div className="improvement">
-            {comparison.comparison.sa_better ? (
+            {comparison.comparison.exact ? (
+              <p>Small enough to solve exactly: both show the optimal route (Held-Karp)</p>
+            ) : comparison.comparison.sa_better ? (
               <p>
                 Simulated Annealing is <strong>{Math.abs(comparison.comparison.improvement_pct).toFixed(1)}%</strong> better
                 (saves {comparison.comparison.distance_difference.toFixed(2)} units)